@@ -9,13 +9,37 @@ profit changes.
 
 """
 import csv
+import json
+import operator
 import os
-import sys
+import tempfile
+from pathlib import Path
 
 
-# Default filenames
-CSV_DATA_FILENAME = os.path.join("Resources", "budget_data.csv")
-TXT_REPORT_FILENAME = os.path.join("analysis", "budget_data_analysis.txt")
+# Default filenames, resolved relative to this script's directory so the script
+# finds its files no matter the current working directory
+SCRIPT_DIRECTORY = Path(__file__).resolve().parent
+CSV_DATA_FILENAME = SCRIPT_DIRECTORY / "Resources" / "budget_data.csv"
+TXT_REPORT_FILENAME = SCRIPT_DIRECTORY / "analysis" / "budget_data_analysis.txt"
+
+# Buffer size in bytes for reading csv files
+CSV_BUFFER_SIZE = 1 << 20
+
+# Suffix appended to a csv filename for its parsed data cache file, and the
+# version of the cached data's format, to be incremented whenever it changes
+CACHE_SUFFIX = ".json"
+CACHE_VERSION = 1
+
+# Report template, joined once at import instead of on every report
+REPORT_TEMPLATE = "\n".join((
+    "Financial Analysis",  # title
+    "-"*28,  # horizontal bar (example was 28 chars wide)
+    "Total Months: {total_months}",
+    "Total: ${total}",
+    "Average Change: ${average_change}",
+    "Greatest Increase in Profits: {increase_month} (${increase_profit})",
+    "Greatest Decrease in Profits: {decrease_month} (${decrease_profit})",
+))
 
 
 def main():
@@ -35,76 +59,177 @@ def import_budget_data(filename=None):
     """Imports budget data from a csv file.
     
     Args:
-        filename (str): path of the csv file to import (default in 
+        filename (str|Path): path of the csv file to import (default in 
             CSV_DATA_FILENAME)
     
     Returns:
-        A list of lists of strings.  Each inner list contains a string for the
-        month-year combined date, and a string for the profit (or loss) value
-        in that order.
+        A list of tuples.  Each tuple contains a string for the month-year
+        combined date, and an int for the profit (or loss) value in that order.
         
     """
     # Handle default filename
     if filename is None:
         filename = CSV_DATA_FILENAME
     
-    # Open and read the csv file, discarding the header
-    with open(filename, "r") as csv_file:
+    # Skip parsing if the data was already parsed and cached by an earlier run
+    source_stamp = get_source_stamp(filename)
+    cache_filename = f"{filename}{CACHE_SUFFIX}"
+    budget_data = load_cache(
+        cache_filename, source_stamp, restore=restore_budget_data
+    )
+    if budget_data is not None:
+        return budget_data
+    
+    # Open and read the csv file, discarding the header, and converting the
+    # profit str to int while parsing so the analysis works on numbers only.
+    # newline="" as recommended by the csv module docs, and a 1 MiB buffer to
+    # read large csv files in fewer system calls.
+    with open(
+        filename, "r", buffering=CSV_BUFFER_SIZE, newline="", encoding="utf-8"
+    ) as csv_file:
         reader = csv.reader(csv_file)
         headers = next(reader)  # csv data header, loaded but discarded
-        budget_data = list(reader)
+        budget_data = [(month, int(profit)) for month, profit in reader]
+    
+    save_cache(cache_filename, source_stamp, budget_data)
     
     return budget_data
 
 
+def restore_budget_data(rows):
+    """Restores budget data loaded from a json cache.
+    
+    Args:
+        rows (list[list]): the cached budget data rows, as json arrays
+    
+    Returns:
+        A list of (month, profit) tuples, as returned by import_budget_data.
+        
+    """
+    return [(str(month), int(profit)) for month, profit in rows]
+
+
+def get_source_stamp(filename):
+    """Gets a stamp identifying the current contents of a csv file.
+    
+    Args:
+        filename (str|Path): path of the csv file
+    
+    Returns:
+        A tuple of CACHE_VERSION, the file's modification time in nanoseconds,
+        and its size in bytes.  A cache is only used if its saved stamp matches
+        this one exactly, so a csv file replaced by one with an older
+        modification time (e.g. by `cp -p`, `rsync -t`, or extracting an
+        archive), or a cache saved in an older format, is never used.
+        
+    """
+    stat = os.stat(filename)
+    return (CACHE_VERSION, stat.st_mtime_ns, stat.st_size)
+
+
+def load_cache(cache_filename, source_stamp, restore):
+    """Loads previously parsed data from a cache file, if it is up to date.
+    
+    Args:
+        cache_filename (str): path of the json cache file
+        source_stamp (tuple[int, int, int]): stamp of the csv file the data
+            should be parsed from, see get_source_stamp
+        restore (Callable): function that rebuilds the parsed data from the
+            json data of the cache, e.g. tuples from json arrays
+    
+    Returns:
+        The cached data, or None if there is no usable cache file, i.e. it is
+        missing, unreadable, damaged, or was saved for a different csv file or
+        cache version.
+        
+    """
+    try:
+        with open(cache_filename, "r", encoding="utf-8") as cache_file:
+            cache = json.load(cache_file)
+        if not (isinstance(cache, list) and len(cache) == 2):
+            return None  # Not a [stamp, data] pair, so not a cache we saved
+        cached_stamp, data = cache
+        if cached_stamp != list(source_stamp):
+            return None  # csv file or cache version changed since it was saved
+        return restore(data)
+    except Exception:
+        # Caching is only an optimization, so any failure to load the cache
+        # just means the csv file is parsed again
+        return None
+
+
+def save_cache(cache_filename, source_stamp, data):
+    """Saves parsed data to a cache file, so later runs can skip parsing.
+    
+    The data is written to a temporary file in the same directory, which then
+    replaces the cache file in a single step, so a failed write or another run
+    reading at the same time never sees a partially written cache.
+    
+    Args:
+        cache_filename (str): path of the json cache file
+        source_stamp (tuple[int, int, int]): stamp of the csv file the data was
+            parsed from, see get_source_stamp
+        data (object): the parsed data to save, made of json compatible types
+    
+    """
+    cache_directory = os.path.dirname(cache_filename) or os.curdir
+    cache_basename = os.path.basename(cache_filename)
+    try:
+        temp_descriptor, temp_filename = tempfile.mkstemp(
+            dir=cache_directory, prefix=f"{cache_basename}.", suffix=".tmp"
+        )
+    except OSError:
+        return  # Caching is only an optimization, so a failure is not an error
+    
+    try:
+        with open(temp_descriptor, "w", encoding="utf-8") as temp_file:
+            json.dump([source_stamp, data], temp_file)
+        os.replace(temp_filename, cache_filename)
+    except OSError:
+        pass  # Caching is only an optimization, so a failure is not an error
+    finally:
+        # Remove the temporary file if it was not moved onto the cache file
+        try:
+            os.remove(temp_filename)
+        except OSError:
+            pass
+
+
 def analyze_budget_data(budget_data):
     """Analyzes the budget data, computing several summary totals.
     
     Args:
-        budget_data (list[list[str]]): budget data rows, each row has first a
-            combination of the month-year date of the period, and second the
-            profit or loss value for that period
+        budget_data (list[tuple[str, int]]): budget data rows, each row has
+            first a combination of the month-year date of the period, and
+            second the int profit or loss value for that period
     
     Returns:
         A dict with the string summary name as the key, and the actual summary
         as the value.
         
     """
-    # Initialize totals
+    # Count months and changes
     total_months = len(budget_data)
     total_changes = total_months - 1  # One fewer changes than months
-    total_profit = 0
-    total_change = 0
     
-    # No profits yet, so no last_profit
-    last_profit = None
-    change = None
+    # Split the rows into a column of months and a column of profits
+    months, profits = zip(*budget_data)
     
-    # Initialize greatest increase and decrease to None
-    greatest_increase = None
-    greatest_decrease = None
+    # Compute the changes in profit between consecutive months, i.e. a first
+    # order forward difference, so changes[i] is the change into months[i+1]
+    changes = list(map(operator.sub, profits[1:], profits[:-1]))
     
-    for month, profit in budget_data:
-        # Convert profit str to int for calculations
-        profit = int(profit)
-        
-        # Accumulate profit to total
-        total_profit += profit
-        
-        # Compute profit change, and accumulate total change
-        if last_profit is not None:
-            change = profit - last_profit
-            total_change += change
-        
-        # Compute greatest increase and decrease
-        if change is not None:
-            if greatest_increase is None or greatest_increase[1] < change:
-                greatest_increase = (month, change)
-            if greatest_decrease is None or greatest_decrease[1] > change:
-                greatest_decrease = (month, change)
-        
-        # Save profit as last_profit for change computations
-        last_profit = profit
+    # Accumulate totals, the builtin sum loops in C rather than bytecode.  The
+    # sum of all changes telescopes to the last profit minus the first one, so
+    # it needs no pass over the changes.
+    total_profit = sum(profits)
+    total_change = profits[-1] - profits[0]
+    
+    # Find the index of the greatest increase and decrease in changes
+    increase_index = max(range(total_changes), key=changes.__getitem__)
+    decrease_index = min(range(total_changes), key=changes.__getitem__)
+    greatest_increase = (months[increase_index + 1], changes[increase_index])
+    greatest_decrease = (months[decrease_index + 1], changes[decrease_index])
     
     # Consolidate the analysis
     analysis = dict(
@@ -131,32 +256,19 @@ def format_analysis_report(analysis):
         A formatted report as a string.
         
     """
-    # Convert analysis values into strings, rounding where appropriate
-    total_months = f"{analysis["total_months"]}"
-    total = f"${round(analysis["total"], 0)}"
-    average_change = f"${round(analysis["average_change"], 2)}"
     increase_month, increase_profit = analysis["greatest_increase"]
     decrease_month, decrease_profit = analysis["greatest_decrease"]
-    increase_profit = f"${increase_profit}"
-    decrease_profit = f"${decrease_profit}"
-    
-    # Format greatest increase and decrease data
-    increase = f"{increase_month} ({increase_profit})"
-    decrease = f"{decrease_month} ({decrease_profit})"
-    
-    # Prepare report lines
-    report_lines = (
-        "Financial Analysis",  # title
-        "-"*28, # horizontal bar (example was 28 chars wide)
-        f"Total Months: {total_months}",
-        f"Total: {total}",
-        f"Average Change: {average_change}",
-        f"Greatest Increase in Profits: {increase}",
-        f"Greatest Decrease in Profits: {decrease}",
-    )    
-
-    # Join heading and field lines into report
-    report = "\n".join(report_lines)
+    
+    # Fill in the report template, rounding where appropriate
+    report = REPORT_TEMPLATE.format(
+        total_months=analysis["total_months"],
+        total=analysis["total"],  # int, so no rounding needed
+        average_change=round(analysis["average_change"], 2),
+        increase_month=increase_month,
+        increase_profit=increase_profit,
+        decrease_month=decrease_month,
+        decrease_profit=decrease_profit,
+    )
 
     return report
 
@@ -166,16 +278,22 @@ def export_and_print_report(report, report_filename=None):
     
     Args:
         report (str): A formatted report.
-        report_filename (str|None): The str filename for the export text file.
+        report_filename (str|Path|None): The filename for the export text file.
             If None, it will default to the constant TXT_REPORT_FILENAME.
     
     """
     if report_filename is None:
         report_filename = TXT_REPORT_FILENAME
 
-    with open(report_filename, "w", encoding="utf-8") as report_file:
-        for file in (report_file, sys.stdout):
-            print(report, file=file)
+    # Write the report file as UTF-8 bytes with "\n" line endings on every
+    # platform, encoded once without going through the text IO layer
+    with open(report_filename, "wb") as report_file:
+        report_file.write(f"{report}\n".encode("utf-8"))
+
+    # Print through stdout's text layer instead, so it uses the console's own
+    # encoding and also works when stdout is a text-only stream (e.g. StringIO,
+    # IDLE, or a notebook)
+    print(report)
 
 
 if __name__ == "__main__":
@@ -9,14 +9,44 @@ text file, and prints it to standard output.
 
 """
 import csv
+import json
 import os
-import sys
-from collections import defaultdict
+import tempfile
+from collections import Counter
+from itertools import starmap
+from operator import itemgetter
+from pathlib import Path
 
 
-# Default filenames
-CSV_DATA_FILENAME = os.path.join("Resources", "election_data.csv")
-TXT_REPORT_FILENAME = os.path.join("analysis", "election_data_analysis.txt")
+# Default filenames, resolved relative to this script's directory so the script
+# finds its files no matter the current working directory
+SCRIPT_DIRECTORY = Path(__file__).resolve().parent
+CSV_DATA_FILENAME = SCRIPT_DIRECTORY / "Resources" / "election_data.csv"
+TXT_REPORT_FILENAME = (
+    SCRIPT_DIRECTORY / "analysis" / "election_data_analysis.txt"
+)
+
+# Buffer size in bytes for reading csv files
+CSV_BUFFER_SIZE = 1 << 20
+
+# Suffix appended to a csv filename for its parsed data cache file, and the
+# version of the cached data's format, to be incremented whenever it changes
+CACHE_SUFFIX = ".json"
+CACHE_VERSION = 1
+
+# Report template, joined once at import instead of on every report.  The
+# horizontal bar is used 4 times.
+HORIZONTAL_BAR = "-"*25
+REPORT_TEMPLATE = "\n".join((
+    "Election Results", HORIZONTAL_BAR,
+    "Total Votes: {total_votes}", HORIZONTAL_BAR,
+    "{candidate_lines}", HORIZONTAL_BAR,
+    "Winner: {winner}", HORIZONTAL_BAR,
+))
+
+# Template for each candidate's line, fields are in the same order as the
+# (name, votes, percentage) tuples of the analysis' candidate_votes
+CANDIDATE_LINE_TEMPLATE = "{0}: {2:2.3f}% ({1})"
 
 
 def main():
@@ -33,34 +63,157 @@ def main():
 
 
 def import_election_data(filename=None):
-    """Imports election data from a csv file.
+    """Imports election data from a csv file, counting votes while reading it.
     
     Args:
-        filename (str): path of the csv file to import (default in 
+        filename (str|Path): path of the csv file to import (default in 
             CSV_DATA_FILENAME)
     
     Returns:
-        A list of lists of strings.  Each inner list contains strings for the
-        ballot-id, county, and candidate name in that order.
+        A Counter mapping each candidate name string to the integer count of
+        ballots for that candidate, in order of each candidate's first ballot.
+        The ballots are counted as they are read, so they are never all held in
+        memory at once, and only the counts are cached for later runs.
         
     """
     if filename is None:
         filename = CSV_DATA_FILENAME
     
-    with open(filename, "r") as csv_file:
+    # Skip parsing if the data was already parsed and cached by an earlier run
+    source_stamp = get_source_stamp(filename)
+    cache_filename = f"{filename}{CACHE_SUFFIX}"
+    election_data = load_cache(
+        cache_filename, source_stamp, restore=restore_election_data
+    )
+    if election_data is not None:
+        return election_data
+    
+    # newline="" as recommended by the csv module docs, and a 1 MiB buffer to
+    # read large csv files in fewer system calls
+    with open(
+        filename, "r", buffering=CSV_BUFFER_SIZE, newline="", encoding="utf-8"
+    ) as csv_file:
         reader = csv.reader(csv_file)
         header = next(reader)  # csv data header, loaded but discarded
-        election_data = list(reader)
+        # Count each candidate's votes.  Counter is a standard library subtype
+        # of dict from the collections module that counts the occurrences of
+        # each item of an iterable.  Together with itemgetter picking the
+        # candidate column only, the counting loop runs in C instead of Python.
+        election_data = Counter(map(itemgetter(2), reader))
+    
+    save_cache(cache_filename, source_stamp, election_data)
     
     return election_data
 
 
+def restore_election_data(candidate_votes):
+    """Restores election data loaded from a json cache.
+    
+    Args:
+        candidate_votes (dict[str, int]): the cached votes per candidate, as a
+            json object
+    
+    Returns:
+        A Counter of votes per candidate, as returned by import_election_data.
+        
+    """
+    return Counter(
+        {str(name): int(votes) for name, votes in candidate_votes.items()}
+    )
+
+
+def get_source_stamp(filename):
+    """Gets a stamp identifying the current contents of a csv file.
+    
+    Args:
+        filename (str|Path): path of the csv file
+    
+    Returns:
+        A tuple of CACHE_VERSION, the file's modification time in nanoseconds,
+        and its size in bytes.  A cache is only used if its saved stamp matches
+        this one exactly, so a csv file replaced by one with an older
+        modification time (e.g. by `cp -p`, `rsync -t`, or extracting an
+        archive), or a cache saved in an older format, is never used.
+        
+    """
+    stat = os.stat(filename)
+    return (CACHE_VERSION, stat.st_mtime_ns, stat.st_size)
+
+
+def load_cache(cache_filename, source_stamp, restore):
+    """Loads previously parsed data from a cache file, if it is up to date.
+    
+    Args:
+        cache_filename (str): path of the json cache file
+        source_stamp (tuple[int, int, int]): stamp of the csv file the data
+            should be parsed from, see get_source_stamp
+        restore (Callable): function that rebuilds the parsed data from the
+            json data of the cache, e.g. tuples from json arrays
+    
+    Returns:
+        The cached data, or None if there is no usable cache file, i.e. it is
+        missing, unreadable, damaged, or was saved for a different csv file or
+        cache version.
+        
+    """
+    try:
+        with open(cache_filename, "r", encoding="utf-8") as cache_file:
+            cache = json.load(cache_file)
+        if not (isinstance(cache, list) and len(cache) == 2):
+            return None  # Not a [stamp, data] pair, so not a cache we saved
+        cached_stamp, data = cache
+        if cached_stamp != list(source_stamp):
+            return None  # csv file or cache version changed since it was saved
+        return restore(data)
+    except Exception:
+        # Caching is only an optimization, so any failure to load the cache
+        # just means the csv file is parsed again
+        return None
+
+
+def save_cache(cache_filename, source_stamp, data):
+    """Saves parsed data to a cache file, so later runs can skip parsing.
+    
+    The data is written to a temporary file in the same directory, which then
+    replaces the cache file in a single step, so a failed write or another run
+    reading at the same time never sees a partially written cache.
+    
+    Args:
+        cache_filename (str): path of the json cache file
+        source_stamp (tuple[int, int, int]): stamp of the csv file the data was
+            parsed from, see get_source_stamp
+        data (object): the parsed data to save, made of json compatible types
+    
+    """
+    cache_directory = os.path.dirname(cache_filename) or os.curdir
+    cache_basename = os.path.basename(cache_filename)
+    try:
+        temp_descriptor, temp_filename = tempfile.mkstemp(
+            dir=cache_directory, prefix=f"{cache_basename}.", suffix=".tmp"
+        )
+    except OSError:
+        return  # Caching is only an optimization, so a failure is not an error
+    
+    try:
+        with open(temp_descriptor, "w", encoding="utf-8") as temp_file:
+            json.dump([source_stamp, data], temp_file)
+        os.replace(temp_filename, cache_filename)
+    except OSError:
+        pass  # Caching is only an optimization, so a failure is not an error
+    finally:
+        # Remove the temporary file if it was not moved onto the cache file
+        try:
+            os.remove(temp_filename)
+        except OSError:
+            pass
+
+
 def analyze_election_data(election_data):
     """Analyzes the election data, computing several summary totals.
     
     Args:
-        election_data (list[list[str]]): election data rows, each row has 3
-            strings, the ballot_id, county, and candidate, in that order.
+        election_data (Counter[str]): election data, the count of votes for
+            each candidate name string.
     
     Returns:
         A dict with the string summary name as the key, and the actual summary
@@ -71,26 +224,11 @@ def analyze_election_data(election_data):
         and the percentage of votes for that candidate as a float.
         
     """
-    total_votes = len(election_data)
-    candidate_votes = defaultdict(int)  # See note below.
-    winner = None
-    
-    # Note: defaultdict is a standard library subtype of dict from the
-    # collections module.  It takes a constructor function as the first argument
-    # to its constructor.  Whenever a value for a given key is first accessed,
-    # it first assigns the result of calling that function.  It is useful for
-    # cases such as these, where we are grouping totals under some category,
-    # such as numer of votes received by a candidate.
-
-    # Count each candidate's votes.
-    for row in election_data:
-        ballot_id, county, candidate = row  # Uses unpacking to get row values
-        candidate_votes[candidate] += 1  # Increments candidate's votes
-    
-    # Determine the winner by populat vote.
-    for candidate, votes in candidate_votes.items():
-        if winner is None or votes > winner[1]:
-            winner = (candidate, votes)
+    candidate_votes = election_data
+    total_votes = candidate_votes.total()  # Sum of all candidates' votes
+    
+    # Determine the winner by popular vote, the candidate with most votes.
+    winner = candidate_votes.most_common(1)[0]
     
     # Gather the analysis
     analysis = dict(
@@ -117,26 +255,19 @@ def format_analysis_report(analysis):
         A formatted report as a string.
         
     """
-    
-    # Prepare a horizontal bar as a string, it's used 4 times
-    horizontal_bar = "-"*25
-    
-    # Candidate lines, generator expression (similar to list comprehension)
-    candidate_lines = (
-        f"{name}: {percentage:2.3f}% ({votes})"
-        for name, votes, percentage in analysis["candidate_votes"]
+    # Candidate lines, formatted by mapping the line template's bound format
+    # method over the (name, votes, percentage) tuples, then joined into a
+    # single block of the report
+    candidate_lines = "\n".join(
+        starmap(CANDIDATE_LINE_TEMPLATE.format, analysis["candidate_votes"])
     )
     
-    # Assemble the lines of the report in order
-    report_lines = [
-        "Election Results", horizontal_bar,
-        f"Total Votes: {analysis["total_votes"]}", horizontal_bar,
-        *candidate_lines, horizontal_bar,
-        f"Winner: {analysis["winner"]}", horizontal_bar,
-    ]
-
-    # Join the report lines into the final report
-    report = "\n".join(report_lines)
+    # Fill in the report template
+    report = REPORT_TEMPLATE.format(
+        total_votes=analysis["total_votes"],
+        candidate_lines=candidate_lines,
+        winner=analysis["winner"],
+    )
     
     return report
 
@@ -146,16 +277,22 @@ def export_and_print_report(report, report_filename=None):
     
     Args:
         report (str): A formatted report.
-        report_filename (str|None): The str filename for the export text file.
+        report_filename (str|Path|None): The filename for the export text file.
             If None, it will default to the constant TXT_REPORT_FILENAME.
     
     """
     if report_filename is None:
         report_filename = TXT_REPORT_FILENAME
 
-    with open(report_filename, "w", encoding="utf-8") as report_file:
-        for file in (report_file, sys.stdout):
-            print(report, file=file)
+    # Write the report file as UTF-8 bytes with "\n" line endings on every
+    # platform, encoded once without going through the text IO layer
+    with open(report_filename, "wb") as report_file:
+        report_file.write(f"{report}\n".encode("utf-8"))
+
+    # Print through stdout's text layer instead, so it uses the console's own
+    # encoding and also works when stdout is a text-only stream (e.g. StringIO,
+    # IDLE, or a notebook)
+    print(report)
 
 
 if __name__ == "__main__":